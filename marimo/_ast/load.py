@@ -60,8 +60,10 @@ def _dynamic_load(filename: str) -> Optional[App]:
     return app
 
 
-def _static_load(filename: str) -> Optional[App]:
-    notebook = parse_notebook(filename)
+def _static_load(
+    filename: str, contents: Optional[str] = None
+) -> Optional[App]:
+    notebook = parse_notebook(filename, contents=contents)
     if notebook is None or not notebook.valid:
         return None
     app = App(**notebook.app.options, _filename=filename)
@@ -104,8 +106,38 @@ def load_app(filename: Optional[str]) -> Optional[App]:
     if not filename.endswith(".py"):
         raise MarimoFileError("File must end with .py or .md")
 
+    return _load_py(filename)
+
+
+def load_app_from_source(contents: str, filename: str) -> Optional[App]:
+    """Load and return app from the already-read source of a notebook.
+
+    Like `load_app`, but parses `contents` instead of reading `filename`
+    again. `filename` must be the Python file `contents` was read from; it
+    is still used for the app and the dynamic loading fallback.
+
+    Args:
+        contents: The source of the notebook file
+        filename: Path to the marimo notebook (.py) the source came from
+
+    Returns:
+        The marimo App instance if the source contains valid code,
+        None if it is empty or contains only comments.
+
+    Raises:
+        MarimoFileError: If the source doesn't define a valid marimo app
+        RuntimeError: If there are issues loading the module
+        SyntaxError: If the source contains a syntax error
+    """
+    if not filename.endswith(".py"):
+        raise MarimoFileError("File must end with .py")
+
+    return _load_py(filename, contents)
+
+
+def _load_py(filename: str, contents: Optional[str] = None) -> Optional[App]:
     try:
-        return _static_load(filename)
+        return _static_load(filename, contents)
     except MarimoFileError:
         # Security advantages of static load are lost here, but reasonable
         # fallback for now.
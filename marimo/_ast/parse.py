@@ -788,8 +788,14 @@ def is_run_guard(node: Optional[Node]) -> bool:
     )
 
 
-def parse_notebook(filename: str) -> Optional[NotebookSerialization]:
-    parser = Parser(filename)
+def parse_notebook(
+    filename: str, *, contents: Optional[str] = None
+) -> Optional[NotebookSerialization]:
+    if contents is None:
+        parser = Parser(filename)
+    else:
+        # Already-read source; strip it as reading the file would
+        parser = Parser(contents=contents.strip())
     if not parser.extractor.contents:
         return None
 
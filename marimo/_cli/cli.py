@@ -29,7 +29,6 @@ from marimo._cli.upgrade import check_for_updates, print_latest_version
 from marimo._config.settings import GLOBAL_SETTINGS
 from marimo._server.file_router import AppFileRouter
 from marimo._server.model import SessionMode
-from marimo._server.start import start
 from marimo._server.tokens import AuthToken
 from marimo._tutorials import (
     Tutorial,
@@ -435,6 +434,8 @@ def edit(
     else:
         name = os.getcwd()
 
+    from marimo._server.start import start
+
     start(
         file_router=AppFileRouter.infer(name),
         development_mode=GLOBAL_SETTINGS.DEVELOPMENT_MODE,
@@ -613,6 +614,8 @@ def new(
     if file_router is None:
         file_router = AppFileRouter.new_file()
 
+    from marimo._server.start import start
+
     start(
         file_router=file_router,
         development_mode=GLOBAL_SETTINGS.DEVELOPMENT_MODE,
@@ -800,6 +803,8 @@ def run(
     # correctness check - don't start the server if we can't import the module
     check_app_correctness(name)
 
+    from marimo._server.start import start
+
     start(
         file_router=AppFileRouter.from_filename(MarimoPath(name)),
         development_mode=GLOBAL_SETTINGS.DEVELOPMENT_MODE,
@@ -907,6 +912,8 @@ def tutorial(
     temp_dir = tempfile.TemporaryDirectory()
     path = create_temp_tutorial_file(name, temp_dir)
 
+    from marimo._server.start import start
+
     start(
         file_router=AppFileRouter.from_filename(path),
         development_mode=GLOBAL_SETTINGS.DEVELOPMENT_MODE,
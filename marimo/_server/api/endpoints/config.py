@@ -15,6 +15,7 @@ from marimo._server.models.models import (
     SuccessResponse,
 )
 from marimo._server.router import APIRouter
+from marimo._snippets.snippets import invalidate_snippets_cache
 from marimo._types.ids import ConsumerId
 
 if TYPE_CHECKING:
@@ -52,6 +53,8 @@ async def save_user_config(
         request, cls=SaveUserConfigurationRequest, allow_unknown_keys=True
     )
     config = app_state.config_manager.save_config(body.config)
+    # Snippet paths are read from the config
+    invalidate_snippets_cache()
 
     # Update the server's view of the config
     if config["completion"]["copilot"]:
@@ -16,9 +16,6 @@ LOGGER = _loggers.marimo_logger()
 router = APIRouter()
 
 
-_SNIPPETS: list[Snippets] = []
-
-
 @router.get("/snippets")
 async def load_snippets(
     request: Request,
@@ -33,6 +30,5 @@ async def load_snippets(
                         $ref: "#/components/schemas/Snippets"
     """
     del request
-    if not _SNIPPETS:
-        _SNIPPETS.append(await read_snippets())
-    return _SNIPPETS[0]
+    # read_snippets caches the result until the snippet files change
+    return await read_snippets()
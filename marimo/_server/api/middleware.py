@@ -24,13 +24,8 @@ from starlette.authentication import (
     SimpleUser,
 )
 from starlette.background import BackgroundTask
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    DispatchFunction,
-    RequestResponseEndpoint,
-)
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.responses import JSONResponse, StreamingResponse
 from starlette.websockets import WebSocket, WebSocketState
 from websockets import ConnectionClosed, connect
 
@@ -44,7 +39,7 @@ from marimo._tracer import server_tracer
 
 if TYPE_CHECKING:
     from starlette.requests import HTTPConnection
-    from starlette.types import ASGIApp, Receive, Scope, Send
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 LOGGER = _loggers.marimo_logger()
 
@@ -58,50 +53,51 @@ class AuthBackend(AuthenticationBackend):
     async def authenticate(
         self, conn: HTTPConnection
     ) -> Optional[tuple[AuthCredentials, BaseUser]]:
-        # --- BEGIN ADDED/MODIFIED LOGGING ---
-        # Use logger instead of print for consistency
-        LOGGER.info(
-            "AuthBackend: Authenticating connection for %s", conn.url
-        )  # Log URL
-        LOGGER.info(
-            "AuthBackend: Headers received: %s", conn.headers
-        )  # Log all headers
-        # Specifically log the cookie header if it exists
-        cookie_header = conn.headers.get("cookie")
-        if cookie_header:
-            # Mask sensitive parts of Cookie for logs
-            parts = cookie_header.split(";")
-            # Mask common sensitive cookie names
-            masked_parts = [
-                p.strip().split("=")[0] + "=..."
-                if any(
-                    sensitive in p.lower()
-                    for sensitive in [
-                        "token",
-                        "session",
-                        "_xsrf",
-                        "access",
-                        "secret",
-                    ]
-                )
-                else p.strip()
-                for p in parts
-                if p.strip()  # Ensure not empty after strip
-            ]
-            log_value = "; ".join(masked_parts)
-            LOGGER.info(
-                "AuthBackend: Cookie header value (masked): %s", log_value
-            )
-            # Uncomment below ONLY for local debugging if needed, avoid in shared logs
-            # LOGGER.info("AuthBackend: Cookie header value (RAW): %s", cookie_header)
-        else:
-            LOGGER.info("AuthBackend: Cookie header MISSING")
-        # --- END ADDED/MODIFIED LOGGING ---
-
         # We may not need to authenticate. This can be disabled
         # because the user is running in a trusted environment
-        # or authentication is handled by a layer above us
+        # or authentication is handled by a layer above us.
+        # In that case, skip straight to granting access for the mode.
         if self.should_authenticate:
+            # --- BEGIN ADDED/MODIFIED LOGGING ---
+            # Use logger instead of print for consistency
+            LOGGER.info(
+                "AuthBackend: Authenticating connection for %s", conn.url
+            )  # Log URL
+            LOGGER.info(
+                "AuthBackend: Headers received: %s", conn.headers
+            )  # Log all headers
+            # Specifically log the cookie header if it exists
+            cookie_header = conn.headers.get("cookie")
+            if cookie_header:
+                # Mask sensitive parts of Cookie for logs
+                parts = cookie_header.split(";")
+                # Mask common sensitive cookie names
+                masked_parts = [
+                    p.strip().split("=")[0] + "=..."
+                    if any(
+                        sensitive in p.lower()
+                        for sensitive in [
+                            "token",
+                            "session",
+                            "_xsrf",
+                            "access",
+                            "secret",
+                        ]
+                    )
+                    else p.strip()
+                    for p in parts
+                    if p.strip()  # Ensure not empty after strip
+                ]
+                log_value = "; ".join(masked_parts)
+                LOGGER.info(
+                    "AuthBackend: Cookie header value (masked): %s", log_value
+                )
+                # Uncomment below ONLY for local debugging if needed, avoid in shared logs
+                # LOGGER.info("AuthBackend: Cookie header value (RAW): %s", cookie_header)
+            else:
+                LOGGER.info("AuthBackend: Cookie header MISSING")
+            # --- END ADDED/MODIFIED LOGGING ---
+
             # Valid auth header
             # This validates we have a valid Cookie (already authenticated)
             # or validates our auth (and sets the cookie)
@@ -207,11 +203,9 @@ class SkewProtectionMiddleware:
         return await self.app(scope, receive, send)
 
 
-class OpenTelemetryMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self, app: ASGIApp, dispatch: DispatchFunction | None = None
-    ) -> None:
-        super().__init__(app, dispatch)
+class OpenTelemetryMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
         if not GLOBAL_SETTINGS.TRACING:
             return
@@ -226,30 +220,35 @@ class OpenTelemetryMiddleware(BaseHTTPMiddleware):
         self.Status = Status
         self.StatusCode = StatusCode
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
-        if not GLOBAL_SETTINGS.TRACING:
-            return await call_next(request)
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http" or not GLOBAL_SETTINGS.TRACING:
+            return await self.app(scope, receive, send)
+
+        method: str = scope["method"]
+        path: str = scope["path"]
 
         with server_tracer.start_as_current_span(
-            f"{request.method} {request.url.path}",
+            f"{method} {path}",
             kind=self.trace.SpanKind.SERVER,
             attributes={
-                "http.method": request.method,
-                "http.target": request.url.path or "",
+                "http.method": method,
+                "http.target": path or "",
             },
         ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
             try:
-                response = await call_next(request)
-                span.set_attribute("http.status_code", response.status_code)
+                await self.app(scope, receive, send_wrapper)
                 span.set_status(self.Status(self.StatusCode.OK))
             except Exception as e:
                 span.set_status(self.Status(self.StatusCode.ERROR, str(e)))
                 raise
-            return response
 
 
 @dataclass
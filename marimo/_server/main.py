@@ -1,37 +1,22 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import functools
+import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, Optional
 
-from starlette.applications import Starlette
-from starlette.exceptions import HTTPException
 from starlette.middleware import Middleware
-from starlette.middleware.cors import CORSMiddleware
 
 from marimo import _loggers
-from marimo._server.api.auth import (
-    RANDOM_SECRET,
-    CustomAuthenticationMiddleware,
-    CustomSessionMiddleware,
-    on_auth_error,
-)
-from marimo._server.api.middleware import (
-    AuthBackend,
-    OpenTelemetryMiddleware,
-    ProxyMiddleware,
-    SkewProtectionMiddleware,
-)
-from marimo._server.api.router import build_routes
-from marimo._server.api.status import (
-    HTTPException as MarimoHTTPException,
-)
-from marimo._server.errors import handle_error
-from marimo._server.lsp import LspServer
 
 if TYPE_CHECKING:
+    from starlette.applications import Starlette
     from starlette.types import Lifespan
 
+    from marimo._server.api.middleware import AuthBackend
+    from marimo._server.lsp import LspServer
+
 LOGGER = _loggers.marimo_logger()
 
 
@@ -52,34 +37,44 @@ def create_starlette_app(
     allow_origins: Optional[tuple[str, ...]] = None,
     lsp_servers: Optional[list[LspServer]] = None,
 ) -> Starlette:
-    # --- BEGIN ADDED LOGGING ---
-    LOGGER.info("create_starlette_app called with enable_auth=%s", enable_auth)
-    LOGGER.info(
-        "create_starlette_app called with allow_origins=%s", allow_origins
+    # Server dependencies are imported lazily so that importing this module
+    # (e.g. from the CLI) does not pull in the full server stack
+    from starlette.applications import Starlette
+    from starlette.exceptions import HTTPException
+    from starlette.middleware.cors import CORSMiddleware
+
+    from marimo._server.api.auth import (
+        RANDOM_SECRET,
+        CustomAuthenticationMiddleware,
+        CustomSessionMiddleware,
+        on_auth_error,
+    )
+    from marimo._server.api.router import build_routes
+    from marimo._server.api.status import (
+        HTTPException as MarimoHTTPException,
     )
-    # --- END ADDED LOGGING ---
+    from marimo._server.errors import handle_error
+
+    otel_middleware, skew_middleware, mpl_middleware = _static_middlewares()
 
     final_middlewares: list[Middleware] = []
+    extend_middlewares = final_middlewares.extend
 
     effective_allow_origins = allow_origins  # Store original arg value
     if allow_origins is None:
         effective_allow_origins = ("localhost", "127.0.0.1") + (
             (host,) if host is not None else ()
         )
-        # --- BEGIN ADDED LOGGING ---
-        LOGGER.info(
-            "create_starlette_app: allow_origins was None, using default: %s",
+
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug(
+            "create_starlette_app enable_auth=%s allow_origins=%s",
+            enable_auth,
             effective_allow_origins,
         )
-        # --- END ADDED LOGGING ---
 
     if enable_auth:
-        # --- BEGIN ADDED LOGGING ---
-        LOGGER.info(
-            "create_starlette_app: Adding CustomSessionMiddleware (enable_auth=True)"
-        )
-        # --- END ADDED LOGGING ---
-        final_middlewares.extend(
+        extend_middlewares(
             [
                 Middleware(
                     CustomSessionMiddleware,
@@ -87,31 +82,14 @@ def create_starlette_app(
                 ),
             ]
         )
-    else:
-        # --- BEGIN ADDED LOGGING ---
-        LOGGER.info(
-            "create_starlette_app: Skipping CustomSessionMiddleware (enable_auth=False)"
-        )
-        # --- END ADDED LOGGING ---
-
-    # --- BEGIN ADDED LOGGING ---
-    LOGGER.info(
-        "create_starlette_app: Initializing AuthBackend with should_authenticate=%s",
-        enable_auth,
-    )
-    LOGGER.info(
-        "create_starlette_app: Adding CORSMiddleware with allow_origins=%s",
-        effective_allow_origins,
-    )
-    # --- END ADDED LOGGING ---
 
-    final_middlewares.extend(
+    extend_middlewares(
         [
-            Middleware(OpenTelemetryMiddleware),
+            otel_middleware,
             Middleware(
                 CustomAuthenticationMiddleware,
                 # Pass the received enable_auth value here
-                backend=AuthBackend(should_authenticate=enable_auth),
+                backend=_auth_backend(enable_auth),
                 on_error=on_auth_error,
             ),
             Middleware(
@@ -122,22 +100,16 @@ def create_starlette_app(
                 allow_methods=["*"],
                 allow_headers=["*"],
             ),
-            Middleware(SkewProtectionMiddleware),
-            _create_mpl_proxy_middleware(),
+            skew_middleware,
+            mpl_middleware,
         ]
     )
 
     if lsp_servers is not None:
-        final_middlewares.extend(
-            _create_lsps_proxy_middleware(servers=lsp_servers)
-        )
+        extend_middlewares(_create_lsps_proxy_middleware(servers=lsp_servers))
 
     if middleware:
-        final_middlewares.extend(middleware)
-
-    # --- BEGIN ADDED LOGGING ---
-    LOGGER.info("create_starlette_app: Creating Starlette app instance.")
-    # --- END ADDED LOGGING ---
+        extend_middlewares(middleware)
 
     return Starlette(
         routes=build_routes(base_url=base_url),
@@ -152,6 +124,8 @@ def create_starlette_app(
 
 
 def _create_mpl_proxy_middleware() -> Middleware:
+    from marimo._server.api.middleware import ProxyMiddleware
+
     # MPL proxy logic
     def mpl_target_url(path: str) -> str:
         # Path format: /mpl/<port>/rest/of/path
@@ -159,9 +133,9 @@ def _create_mpl_proxy_middleware() -> Middleware:
         return f"http://localhost:{port}"
 
     def mpl_path_rewrite(path: str) -> str:
-        # Remove the /mpl/<port>/ prefix
-        rest = path.split("/", 3)[3]
-        return f"/{rest}"
+        # Remove the /mpl/<port>/ prefix; /mpl/<port> rewrites to /
+        parts = path.split("/", 3)
+        return f"/{parts[3]}" if len(parts) > 3 else "/"
 
     return Middleware(
         ProxyMiddleware,
@@ -171,24 +145,53 @@ def _create_mpl_proxy_middleware() -> Middleware:
     )
 
 
+# AuthBackend only holds the should_authenticate flag, so there are
+# just two distinct instances to share across apps
+@functools.lru_cache(maxsize=2)
+def _auth_backend(should_authenticate: bool) -> AuthBackend:
+    from marimo._server.api.middleware import AuthBackend
+
+    return AuthBackend(should_authenticate=should_authenticate)
+
+
+@functools.cache
+def _static_middlewares() -> tuple[Middleware, Middleware, Middleware]:
+    # Middleware that does not depend on create_starlette_app's arguments
+    # is built once and shared across apps
+    from marimo._server.api.middleware import (
+        OpenTelemetryMiddleware,
+        SkewProtectionMiddleware,
+    )
+
+    return (
+        Middleware(OpenTelemetryMiddleware),
+        Middleware(SkewProtectionMiddleware),
+        _create_mpl_proxy_middleware(),
+    )
+
+
 def _create_lsps_proxy_middleware(
     *, servers: list[LspServer]
 ) -> list[Middleware]:
+    from marimo._server.api.middleware import ProxyMiddleware
+
     middlewares: list[Middleware] = []
     for server in servers:
-
-        def path_rewrite(server_id: str) -> Callable[[str], str]:
-            to_replace = (
-                "/copilot" if server_id == "copilot" else f"/lsp/{server_id}"
-            )
-            return lambda _: to_replace
-
+        # The rewritten path does not depend on the request path,
+        # so it is computed once per server
+        to_replace = (
+            "/copilot" if server.id == "copilot" else f"/lsp/{server.id}"
+        )
         middlewares.append(
             Middleware(
                 ProxyMiddleware,
                 proxy_path=f"/lsp/{server.id}",
                 target_url=f"http://localhost:{server.port}",
-                path_rewrite=path_rewrite(server.id),
+                path_rewrite=_lsp_path_rewrite(to_replace),
             )
         )
     return middlewares
+
+
+def _lsp_path_rewrite(to_replace: str) -> Callable[[str], str]:
+    return lambda _: to_replace
@@ -1,117 +1,316 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
-from collections.abc import Awaitable, Generator
+import asyncio
+import functools
+import os
+import re
+import sys
+import weakref
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Generator,
+    Mapping,
+)
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from marimo import _loggers
-from marimo._ast.load import load_app
-from marimo._config.manager import get_default_config_manager
+from marimo._ast.cell_manager import CellManager
+from marimo._ast.load import load_app_from_source
+from marimo._ast.parse import parse_notebook
+from marimo._config.manager import (
+    MarimoConfigManager,
+    ProjectConfigManager,
+    get_default_config_manager,
+)
+from marimo._schemas.serialization import SetupCell, UnparsableCell
 from marimo._utils.paths import marimo_package_path
 
+if TYPE_CHECKING:
+    from marimo._ast.app import App
+    from marimo._types.ids import CellId_t
+
 LOGGER = _loggers.marimo_logger()
 
 
-@dataclass
+# Snippets are held in memory for the lifetime of the server, so use
+# slotted dataclasses where supported (Python 3.10+)
+_DATACLASS_KWARGS: dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_KWARGS)
 class SnippetSection:
     id: str
     html: Optional[str] = None
     code: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class Snippet:
     title: str
     sections: list[SnippetSection]
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class Snippets:
     snippets: list[Snippet]
 
 
+# Snippets are static content, so they are cached and only re-read when
+# the set of snippet files or any of their modification times change
+_SNIPPETS_CACHE: dict[tuple[tuple[str, int], ...], Snippets] = {}
+# asyncio.Lock binds to an event loop (at construction on Python 3.9, on
+# first contention after that), so keep one lock per running loop
+_SNIPPETS_CACHE_LOCKS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Lock
+] = weakref.WeakKeyDictionary()
+
+
+def invalidate_snippets_cache() -> None:
+    _SNIPPETS_CACHE.clear()
+    _SNIPPETS_CONFIG_CACHE.clear()
+
+
 async def read_snippets() -> Snippets:
-    snippets: list[Snippet] = []
-
-    for file in read_snippet_filenames_from_config():
-        app = load_app(file)
-        assert app is not None
-        sections: list[SnippetSection] = []
-        title = ""
-
-        for cell in app._cell_manager.cells():
-            if not cell:
-                continue
-
-            code = cell._cell.code
-            if should_ignore_code(code):
-                continue
-
-            if is_markdown(code):
-                if not title and "# " in code:
-                    title = get_title_from_code(code)
-
-                ret = cell.run()
-                if isinstance(ret, Awaitable):
-                    output, _defs = await ret
-                else:
-                    output, _defs = ret
-                sections.append(
-                    SnippetSection(html=output.text, id=cell._cell.cell_id)
-                )
-            else:
-                sections.append(
-                    SnippetSection(code=code, id=cell._cell.cell_id)
-                )
+    filenames = list(read_snippet_filenames_from_config())
+    signature = tuple(
+        sorted((file, os.stat(file).st_mtime_ns) for file in filenames)
+    )
+
+    # Hold the lock while reading so that concurrent requests
+    # wait for a single computation instead of repeating it
+    async with _snippets_cache_lock():
+        cached = _SNIPPETS_CACHE.get(signature)
+        if cached is not None:
+            return cached
 
-        snippets.append(Snippet(title=title, sections=sections))
+        snippets = await _read_snippets(filenames)
+        _SNIPPETS_CACHE.clear()
+        _SNIPPETS_CACHE[signature] = snippets
+        return snippets
 
-    return Snippets(
-        snippets=sorted(snippets, key=lambda snippet: snippet.title)
+
+async def iter_snippets() -> AsyncIterator[Snippet]:
+    # Yield snippets one at a time, in title order
+    for snippet in (await read_snippets()).snippets:
+        yield snippet
+
+
+def _snippets_cache_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _SNIPPETS_CACHE_LOCKS.get(loop)
+    if lock is None:
+        lock = _SNIPPETS_CACHE_LOCKS[loop] = asyncio.Lock()
+    return lock
+
+
+async def _read_snippets(filenames: list[str]) -> Snippets:
+    # Files are loaded one after another on the event loop; gathering only
+    # lets the async markdown cell runs of different files interleave
+    snippets = await asyncio.gather(
+        *(_read_snippet(file) for file in filenames)
     )
 
+    return Snippets(snippets=sorted(snippets, key=attrgetter("title")))
+
+
+async def _read_snippet(file: str) -> Snippet:
+    scanned, app = _load_snippet_file(file)
+    if scanned is not None:
+        return Snippet(
+            title="",
+            sections=[
+                SnippetSection(code=code, id=sys.intern(cell_id))
+                for cell_id, code in scanned
+                if not should_ignore_code(code)
+            ],
+        )
+
+    assert app is not None
+    sections: list[SnippetSection] = []
+    pending_runs: list[
+        tuple[SnippetSection, Awaitable[tuple[Any, Mapping[str, Any]]]]
+    ] = []
+    sections_append = sections.append
+    title = ""
+
+    for cell in app._cell_manager.cells():
+        if not cell:
+            continue
+
+        inner = cell._cell
+        code = inner.code
+        if should_ignore_code(code):
+            continue
+
+        # Strip once and share it between the markdown predicates below
+        stripped = code.strip()
+
+        if is_markdown(stripped):
+            if not title and "# " in code:
+                title = get_title_from_code(code, stripped)
+
+            section = SnippetSection(id=sys.intern(inner.cell_id))
+            sections_append(section)
+            ret = cell.run()
+            if isinstance(ret, Awaitable):
+                # Render async cells together once all cells are visited;
+                # the section keeps its place in the list until then
+                pending_runs.append((section, ret))
+            else:
+                output, _defs = ret
+                section.html = output.text
+        else:
+            sections_append(
+                SnippetSection(code=code, id=sys.intern(inner.cell_id))
+            )
+
+    if pending_runs:
+        results = await asyncio.gather(*(ret for _, ret in pending_runs))
+        for (section, _), (output, _defs) in zip(pending_runs, results):
+            section.html = output.text
+
+    # Cell IDs are generated deterministically, so the same IDs repeat
+    # across snippets; intern them (and titles) to share storage
+    return Snippet(title=sys.intern(title), sections=sections)
+
+
+def _load_snippet_file(
+    file: str,
+) -> tuple[Optional[list[tuple[CellId_t, str]]], Optional[App]]:
+    # Read the file once and share the source between both load paths;
+    # an App is only built when the fast scan can't be used
+    source = _read_source(file)
+    scanned = _scan_cells_fast(file, source)
+    if scanned is not None:
+        return scanned, None
+    return None, load_app_from_source(source, filename=file)
+
+
+def _read_source(file: str) -> str:
+    with open(file, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def _scan_cells_fast(
+    file: str, source: str
+) -> Optional[list[tuple[CellId_t, str]]]:
+    """Read the cells of a snippet file that has no markdown.
+
+    Code-only snippets never need their cells run, so their code is taken
+    from the parsed notebook without building and compiling an App.
+    Returns None when the file needs the full load_app path.
+    """
+    if "mo.md" in source:
+        return None
+
+    notebook = parse_notebook(file, contents=source)
+    if notebook is None or not notebook.valid:
+        return None
+    if any(
+        isinstance(cell, (SetupCell, UnparsableCell))
+        for cell in notebook.cells
+    ):
+        return None
+
+    # Cell IDs are deterministic, so this matches the IDs load_app assigns
+    cell_manager = CellManager()
+    return [
+        (cell_manager.create_cell_id(), cell.code) for cell in notebook.cells
+    ]
+
 
 def should_ignore_code(code: str) -> bool:
     return code == "import marimo as mo"
 
 
-def get_title_from_code(code: str) -> str:
+# The title runs from the first "#" to the end of its line; on a single
+# line it ends at the first double quote, then at the first single quote
+_TITLE_RE = re.compile(r"#([^\n]*)\n|#([^\"]*)\"|#([^']*)'|#(.*)")
+
+
+def get_title_from_code(code: str, stripped: Optional[str] = None) -> str:
     # We intentionally avoid AST parsing here to avoid the overhead
-    if not code:
-        return ""
-    code = code.strip()
-    if not (code.startswith("mo.md") or code.startswith("#")):
+    if stripped is None:
+        stripped = code.strip()
+    if not stripped.startswith(("mo.md", "#")):
         return ""
 
-    start = code.find("#")
-    if start == -1:
+    match = _TITLE_RE.search(stripped)
+    if match is None:
         return ""
+    return match.group(match.lastindex or 0).strip()
 
-    # Skip the # character
-    start += 1
 
-    # Find end of title
-    for end_char in ("\n", '"', "'"):
-        if (end := code.find(end_char, start)) != -1:
-            return code[start:end].strip()
+def is_markdown(stripped: str) -> bool:
+    return stripped.startswith("mo.md")
 
-    return code[start:].strip()
 
+def read_snippet_filenames_from_config() -> Generator[str, Any, None]:
+    include_default_snippets, custom_paths = _snippets_config()
+    return read_snippet_filenames(include_default_snippets, list(custom_paths))
 
-def is_markdown(code: str) -> bool:
-    return code.strip().startswith("mo.md")
 
+# The snippets config is only re-read when the user config file or the
+# project's pyproject.toml change, so edits made outside the server's
+# config endpoint are still picked up
+_SNIPPETS_CONFIG_CACHE: dict[
+    tuple[tuple[str, int], ...], tuple[bool, tuple[str, ...]]
+] = {}
+
+
+def _snippets_config() -> tuple[bool, tuple[str, ...]]:
+    config_manager = get_default_config_manager(current_path=None)
+    signature = _config_files_signature(config_manager)
+    cached = _SNIPPETS_CONFIG_CACHE.get(signature)
+    if cached is not None:
+        return cached
 
-def read_snippet_filenames_from_config() -> Generator[str, Any, None]:
     # Get custom snippets path from config if present
-    config = get_default_config_manager(current_path=None).get_config()
+    config = config_manager.get_config()
     custom_paths = config.get("snippets", {}).get("custom_paths", [])
     include_default_snippets = config.get("snippets", {}).get(
         "include_default_snippets", True
     )
-    return read_snippet_filenames(include_default_snippets, custom_paths)
+    snippets_config = (include_default_snippets, tuple(custom_paths))
+    _SNIPPETS_CONFIG_CACHE.clear()
+    _SNIPPETS_CONFIG_CACHE[signature] = snippets_config
+    return snippets_config
+
+
+def _config_files_signature(
+    config_manager: MarimoConfigManager,
+) -> tuple[tuple[str, int], ...]:
+    paths: list[str] = []
+    try:
+        paths.append(config_manager.user_config_mgr.get_config_path())
+    except OSError:
+        pass
+    paths.extend(
+        str(partial.pyproject_path)
+        for partial in config_manager.partials
+        if isinstance(partial, ProjectConfigManager)
+        and partial.pyproject_path is not None
+    )
+
+    signature: list[tuple[str, int]] = []
+    for path in paths:
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            signature.append((path, -1))
+    return tuple(signature)
+
+
+@functools.cache
+def _default_snippets_path() -> Path:
+    return marimo_package_path() / "_snippets" / "data"
 
 
 def read_snippet_filenames(
@@ -119,7 +318,7 @@ def read_snippet_filenames(
 ) -> Generator[str, Any, None]:
     paths: list[Path] = []
     if include_default_snippets:
-        paths.append(marimo_package_path() / "_snippets" / "data")
+        paths.append(_default_snippets_path())
     if custom_paths:
         paths.extend([Path(p) for p in custom_paths])
     for root_path in paths:
@@ -134,5 +333,24 @@ def read_snippet_filenames(
                 "Snippets path %s not a directory - ignoring", root_path
             )
             continue
-        for file in root_path.resolve().rglob("*.py"):
-            yield str(file)
+        yield from _walk_python_files(str(root_path.resolve()))
+
+
+def _walk_python_files(root: str) -> Generator[str, Any, None]:
+    # Like Path.rglob("*.py"), but os.scandir reuses the directory entry
+    # type instead of stat-ing and allocating a Path for every entry.
+    # As with rglob, symlinked directories are not followed and
+    # unreadable directories are skipped.
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            scanner = os.scandir(directory)
+        except PermissionError:
+            continue
+        with scanner as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
@@ -270,3 +270,18 @@ class TestGetCodes:
         else:
             assert len(caplog.records) == 1
         assert "kwarg_that_doesnt_exist" in caplog.text
+
+
+def test_load_app_from_source_matches_load_app() -> None:
+    filename = get_filepath("test_generate_filecontents")
+    with open(filename, encoding="utf-8") as f:
+        contents = f.read()
+
+    app = load.load_app_from_source(contents, filename=filename)
+    expected = load.load_app(filename)
+    assert app is not None
+    assert expected is not None
+    assert list(app._cell_manager.codes()) == list(
+        expected._cell_manager.codes()
+    )
+    assert app._filename == expected._filename
@@ -1,6 +1,13 @@
 # Copyright 2024 Marimo. All rights reserved.
+import asyncio
+import dataclasses
+
+import pytest
 from starlette.testclient import TestClient
 
+from marimo._server.api.endpoints import documentation
+from marimo._snippets.snippets import Snippets, read_snippets
+
 
 def test_snippets(client: TestClient) -> None:
     response = client.get("/api/documentation/snippets")
@@ -18,3 +25,20 @@ def test_snippets(client: TestClient) -> None:
     assert content["snippets"] is not None
     assert len(content["snippets"]) > 0
     assert content["snippets"] == snippets
+
+    # the response body matches the serialized Snippets dataclass
+    assert content == dataclasses.asdict(asyncio.run(read_snippets()))
+
+
+def test_snippets_load_error(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def broken_read_snippets() -> Snippets:
+        raise RuntimeError("broken snippet")
+
+    monkeypatch.setattr(documentation, "read_snippets", broken_read_snippets)
+    client = TestClient(client.app, raise_server_exceptions=False)
+    response = client.get("/api/documentation/snippets")
+    # Loading fails before the response starts, so it is a server error
+    # instead of a truncated 200
+    assert response.status_code == 500, response.text
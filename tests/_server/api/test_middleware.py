@@ -23,7 +23,12 @@ from marimo._server.api.middleware import (
     _AsyncHTTPClient,
     _URLRequest,
 )
-from marimo._server.main import create_starlette_app
+from marimo._server.lsp import CopilotLspServer, PyLspServer
+from marimo._server.main import (
+    _create_lsps_proxy_middleware,
+    _create_mpl_proxy_middleware,
+    create_starlette_app,
+)
 from marimo._server.model import SessionMode
 from marimo._server.tokens import AuthToken
 from marimo._server.utils import find_free_port
@@ -82,6 +87,39 @@ def test_base_url() -> None:
     assert response.status_code == 404, response.text
 
 
+def test_lsps_proxy_path_rewrite() -> None:
+    middlewares = _create_lsps_proxy_middleware(
+        servers=[PyLspServer(port=8000), CopilotLspServer(port=8001)]
+    )
+    assert [m.kwargs["proxy_path"] for m in middlewares] == [
+        "/lsp/pylsp",
+        "/lsp/copilot",
+    ]
+    assert [m.kwargs["target_url"] for m in middlewares] == [
+        "http://localhost:8000",
+        "http://localhost:8001",
+    ]
+    # Each server keeps its own rewrite target
+    assert [
+        m.kwargs["path_rewrite"]("/lsp/anything") for m in middlewares
+    ] == ["/lsp/pylsp", "/copilot"]
+
+
+def test_mpl_proxy_path_rewrite() -> None:
+    middleware = _create_mpl_proxy_middleware()
+    target_url = middleware.kwargs["target_url"]
+    path_rewrite = middleware.kwargs["path_rewrite"]
+
+    assert target_url("/mpl/8080/static/js/mpl.js") == "http://localhost:8080"
+    assert path_rewrite("/mpl/8080/static/js/mpl.js") == "/static/js/mpl.js"
+    assert target_url("/mpl/8080/") == "http://localhost:8080"
+    assert path_rewrite("/mpl/8080/") == "/"
+    assert path_rewrite("/mpl/8080") == "/"
+    # Percent-decoded newlines are kept in the rewritten path
+    assert target_url("/mpl/8080/a\nb") == "http://localhost:8080"
+    assert path_rewrite("/mpl/8080/a\nb") == "/a\nb"
+
+
 def test_skew_protection(edit_app: Starlette) -> None:
     client = TestClient(edit_app)
     # Unauthorized access
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import os
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING, Any
+
 import pytest
 
+from marimo._ast.load import load_app
 from marimo._snippets.snippets import (
+    Snippet,
+    Snippets,
+    SnippetSection,
+    _scan_cells_fast,
+    _snippets_config,
     get_title_from_code,
+    invalidate_snippets_cache,
+    iter_snippets,
     read_snippet_filenames,
+    read_snippet_filenames_from_config,
     read_snippets,
 )
 from marimo._utils.platform import is_windows
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 async def test_snippets() -> None:
     snippets = await read_snippets()
@@ -24,6 +41,116 @@ async def test_snippets() -> None:
     )
 
 
+async def test_snippets_cached() -> None:
+    invalidate_snippets_cache()
+    snippets = await read_snippets()
+    # Unchanged files are served from the cache
+    assert await read_snippets() is snippets
+
+    invalidate_snippets_cache()
+    reread = await read_snippets()
+    assert reread is not snippets
+    assert reread == snippets
+
+
+async def test_iter_snippets() -> None:
+    snippets = await read_snippets()
+    assert [snippet async for snippet in iter_snippets()] == snippets.snippets
+
+
+async def test_snippets_match_full_app_load() -> None:
+    # Reference reader: load every file as an App and render each cell,
+    # with none of the fast paths used by read_snippets
+    expected: list[Snippet] = []
+    for file in read_snippet_filenames_from_config():
+        app = load_app(file)
+        assert app is not None
+        sections: list[SnippetSection] = []
+        title = ""
+        for cell in app._cell_manager.cells():
+            if not cell:
+                continue
+            code = cell._cell.code
+            if code == "import marimo as mo":
+                continue
+            if code.strip().startswith("mo.md"):
+                if not title and "# " in code:
+                    title = get_title_from_code(code)
+                ret = cell.run()
+                if isinstance(ret, Awaitable):
+                    ret = await ret
+                output, _defs = ret
+                sections.append(
+                    SnippetSection(html=output.text, id=cell._cell.cell_id)
+                )
+            else:
+                sections.append(
+                    SnippetSection(code=code, id=cell._cell.cell_id)
+                )
+        expected.append(Snippet(title=title, sections=sections))
+    expected.sort(key=lambda snippet: snippet.title)
+
+    invalidate_snippets_cache()
+    assert await read_snippets() == Snippets(snippets=expected)
+
+
+def test_snippets_concurrent_reads_across_event_loops() -> None:
+    async def read_concurrently() -> None:
+        invalidate_snippets_cache()
+        first, second = await asyncio.gather(read_snippets(), read_snippets())
+        assert first is second
+
+    # Each loop contends on the cache lock; it must not be shared
+    asyncio.run(read_concurrently())
+    asyncio.run(read_concurrently())
+
+
+def test_scan_cells_fast_code_only(tmp_path: Path) -> None:
+    file = tmp_path / "snippet.py"
+    file.write_text(
+        """import marimo
+
+app = marimo.App()
+
+
+@app.cell
+def _():
+    import marimo as mo
+    return (mo,)
+
+
+@app.cell
+def _():
+    x = 1
+    y = (
+        x + 1
+    )
+    return x, y
+
+
+if __name__ == "__main__":
+    app.run()
+""",
+        encoding="utf-8",
+    )
+    app = load_app(str(file))
+    assert app is not None
+    source = file.read_text(encoding="utf-8")
+    assert _scan_cells_fast(str(file), source) == [
+        (cell._cell.cell_id, cell._cell.code)
+        for cell in app._cell_manager.cells()
+        if cell
+    ]
+
+
+def test_scan_cells_fast_skips_markdown() -> None:
+    filenames = list(read_snippet_filenames(True, []))
+    # Bundled snippets have markdown, so they need the full load_app path
+    for file in filenames:
+        with open(file, encoding="utf-8") as f:
+            assert _scan_cells_fast(file, f.read()) is None
+
+
 def test_get_title_from_code_empty() -> None:
     assert get_title_from_code("") == ""
 
@@ -57,6 +184,11 @@ def test_get_title_from_code_with_mo_md() -> None:
     assert get_title_from_code(code) == "This is a title"
 
 
+def test_get_title_from_code_with_quotes_in_title() -> None:
+    code = 'mo.md(\n    r"""\n    # It\'s a "title"\n    Body\n    """\n)'
+    assert get_title_from_code(code) == 'It\'s a "title"'
+
+
 total_snippets = len(list(read_snippet_filenames(True, [])))
 
 
@@ -88,3 +220,44 @@ def test_read_snippet_filenames(
     assert len(filenames) == expected_snippets
     assert all(filename.endswith(".py") for filename in filenames)
     assert all("_snippets/data" in filename for filename in filenames)
+
+
+def test_read_snippet_filenames_skips_unreadable_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "snippet.py").write_text("", encoding="utf-8")
+    unreadable = tmp_path / "unreadable"
+    unreadable.mkdir()
+    (unreadable / "hidden.py").write_text("", encoding="utf-8")
+
+    scandir = os.scandir
+
+    def fake_scandir(path: str) -> Any:
+        if path == str(unreadable):
+            raise PermissionError(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", fake_scandir)
+    filenames = list(read_snippet_filenames(False, [str(tmp_path)]))
+    assert filenames == [str(tmp_path / "snippet.py")]
+
+
+def test_snippets_config_rereads_changed_pyproject(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        '[tool.marimo.snippets]\ncustom_paths = ["first"]\n',
+        encoding="utf-8",
+    )
+    assert _snippets_config()[1] == ("first",)
+
+    pyproject.write_text(
+        '[tool.marimo.snippets]\ncustom_paths = ["second"]\n',
+        encoding="utf-8",
+    )
+    # Make sure the change is visible even on coarse mtime filesystems
+    stat = pyproject.stat()
+    os.utime(pyproject, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _snippets_config()[1] == ("second",)